@@ -1,19 +1,24 @@
 #!/usr/bin/env python3
 
 import os
+import re
 import sys
 import json
 import datetime
 import time
 import argparse
+import shutil
+import threading
+import ssl
+import http.client
 from yt_dlp import YoutubeDL
-from urllib.request import Request, urlopen
-from urllib.error import URLError, HTTPError
 from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 from rich import box
+from rich.markup import escape
 
 # Load .env file if it exists (python-dotenv is optional)
 try:
@@ -29,6 +34,7 @@ WATCHLATER_URL = os.environ.get("WATCHLATER_URL", "https://www.youtube.com/playl
 OUTPUT_DIR = os.environ.get("OUTPUT_DIR", "./yt_watchlater")
 ARCHIVE_JSON = os.environ.get("ARCHIVE_JSON", "./yt_watchlater_archive.json")
 COOKIES_FILE = os.environ.get("COOKIES_FILE", None)  # optional
+COOKIE_STORE = os.environ.get("COOKIE_STORE", None)  # optional, refreshed cookies are saved here (default: COOKIES_FILE)
 
 # Webhook configuration (optional)
 WEBHOOK_URL = os.environ.get("WEBHOOK_URL", None)
@@ -38,6 +44,20 @@ WEBHOOK_SECRET = os.environ.get("WEBHOOK_SECRET", None)
 # Storage retention configuration (optional)
 RETENTION_DAYS = os.environ.get("RETENTION_DAYS", None)
 
+# Partial download tracking (resume across runs + garbage collection of orphaned partial files)
+PARTIAL_STATE_JSON = os.environ.get("PARTIAL_STATE_JSON", "./yt_watchlater_partial.json")
+PARTIAL_MAX_AGE_DAYS = os.environ.get("PARTIAL_MAX_AGE_DAYS", "7")  # Default: 7 days
+
+# Download profile configuration (optional)
+DOWNLOAD_PROFILE = os.environ.get("DOWNLOAD_PROFILE", "best")  # Default: best (largest streams, merged)
+PROFILES_JSON = os.environ.get("PROFILES_JSON", None)  # Optional JSON file with custom profiles
+
+# Local staging configuration (optional)
+# Downloads and merges happen in STAGING_DIR; finished files are moved to OUTPUT_DIR in the background
+STAGING_DIR = os.environ.get("STAGING_DIR", None)  # Default: None (download straight into OUTPUT_DIR)
+MOVER_WORKERS = os.environ.get("MOVER_WORKERS", "2")  # Default: 2 concurrent moves
+MOVE_QUEUE_JSON = os.environ.get("MOVE_QUEUE_JSON", "./yt_watchlater_moves.json")
+
 # Playlist management configuration (optional)
 PLAYLIST_REVERSE = os.environ.get("PLAYLIST_REVERSE", "true").lower() in ("true", "1", "yes")  # Default: true (newest first)
 MAX_DOWNLOADS = os.environ.get("MAX_DOWNLOADS", None)  # Default: None (unlimited)
@@ -57,6 +77,8 @@ Examples:
   python download.py                    # Normal rich output
   python download.py --json-output     # JSON output mode
   JSON_OUTPUT=true python download.py  # JSON output via environment variable
+  python download.py --profile 720p    # Use the 720p download profile
+  python download.py --estimate        # Compare profiles for the current backlog
         """
     )
     parser.add_argument(
@@ -64,6 +86,15 @@ Examples:
         action="store_true",
         help="Output results in JSON format instead of rich terminal formatting"
     )
+    parser.add_argument(
+        "--profile",
+        help="Download profile to use for this run (overrides DOWNLOAD_PROFILE)"
+    )
+    parser.add_argument(
+        "--estimate",
+        action="store_true",
+        help="Show estimated size and merge count of the current backlog for each profile, without downloading"
+    )
     return parser.parse_args()
 
 # Parse arguments
@@ -73,6 +104,10 @@ args = parse_arguments()
 if args.json_output:
     JSON_OUTPUT = True
 
+# Override DOWNLOAD_PROFILE with command line argument if provided
+if args.profile:
+    DOWNLOAD_PROFILE = args.profile
+
 # Initialize Rich console (conditional based on JSON mode)
 console = Console() if not JSON_OUTPUT else None
 
@@ -83,9 +118,63 @@ stats = {
     "skipped": [],
     "errors": [],
     "cleaned_files": [],
-    "cleaned_bytes": 0
+    "cleaned_bytes": 0,
+    "resumed": [],
+    "cleaned_partial_files": [],
+    "cleaned_partial_bytes": 0,
+    "estimate": None
 }
 
+# Built-in download profiles (extend or override with PROFILES_JSON)
+#   max_height:        resolution cap, e.g. 720 (formats with unknown height are allowed)
+#   vcodec:            preferred video codec prefix, e.g. "avc1", "vp09", "av01" (falls back to any codec)
+#   max_stream_size:   skip video/audio streams larger than this, e.g. "500M" (unknown sizes are allowed);
+#                      a merged download can be up to the sum of its two streams
+#   audio_only:        best audio stream only, no video and no merge
+#   prefer_merge_free: prefer a single already-muxed file over merging separate streams
+DOWNLOAD_PROFILES = {
+    "best": {},  # Largest video + audio streams, merged to MP4
+    "1080p": {"max_height": 1080},
+    "720p": {"max_height": 720, "vcodec": "avc1"},
+    "compact": {"max_height": 720, "max_stream_size": "500M", "prefer_merge_free": True},
+    "audio": {"audio_only": True},
+}
+PROFILE_KEYS = ("max_height", "vcodec", "max_stream_size", "audio_only", "prefer_merge_free")
+# Values are interpolated into a yt-dlp format spec, so only accept what is valid there
+PROFILE_SIZE_RE = re.compile(r"^\d+(\.\d+)?[KMGT]i?B?$")
+PROFILE_VCODEC_RE = re.compile(r"^[\w.]+$")
+
+# In-progress downloads (video_id -> formats, expected/downloaded bytes per partial file)
+partial_state = {}
+_partial_state_saved_at = 0
+PARTIAL_STATE_SAVE_INTERVAL = 5  # seconds between writes while downloading
+
+# Leftovers of interrupted downloads: .part/.ytdl files, fragments, per-format
+# intermediates ("... [id].f137.mp4"), merger temp files ("... [id].temp.mp4")
+# and half-copied files from the staging mover ("... [id].mp4.moving")
+PARTIAL_FILE_RE = re.compile(r"(\.part|\.part-Frag\d+(\.part)?|\.ytdl|\.moving|\]\.(f[\w-]+|temp)\.\w+)$")
+
+# Guards the archive and move queue, which the background mover updates too
+archive_lock = threading.RLock()
+
+# Serializes webhook sends (mover threads send too); http.client connections aren't thread-safe
+webhook_lock = threading.RLock()
+
+# Staged files waiting to be moved to OUTPUT_DIR (staging path -> video_id, dest, deferred webhook)
+move_queue = {}
+_mover = None
+
+# Finished downloads waiting for post-processing (merge); post_hook archives them
+# under the final file path
+pending_downloads = {}
+
+def format_size(num_bytes):
+    """Format a byte count as MB, or GB once it reaches 1 GB"""
+    size_mb = num_bytes / (1024 * 1024)
+    if size_mb >= 1024:
+        return f"{size_mb / 1024:.2f} GB"
+    return f"{size_mb:.1f} MB"
+
 def format_json_output():
     """Format the final results as JSON output"""
     if not stats["start_time"]:
@@ -95,10 +184,12 @@ def format_json_output():
 
     # Calculate cleanup statistics
     cleanup_stats = None
-    if stats['cleaned_files']:
+    if stats['cleaned_files'] or stats['cleaned_partial_files']:
         cleanup_stats = {
             "files_deleted": len(stats['cleaned_files']),
-            "space_freed_bytes": stats['cleaned_bytes']
+            "space_freed_bytes": stats['cleaned_bytes'],
+            "partial_files_deleted": len(stats['cleaned_partial_files']),
+            "partial_space_freed_bytes": stats['cleaned_partial_bytes']
         }
 
     # Build the JSON output
@@ -108,6 +199,7 @@ def format_json_output():
             "downloaded_count": len(stats['downloaded']),
             "skipped_count": len(stats['skipped']),
             "error_count": len(stats['errors']),
+            "resumed_count": len(stats['resumed']),
             "duration_seconds": round(elapsed, 2)
         },
         "downloaded": stats['downloaded'],
@@ -119,6 +211,10 @@ def format_json_output():
     if cleanup_stats:
         result["cleanup"] = cleanup_stats
 
+    # Add profile estimates if this was an --estimate run
+    if stats["estimate"]:
+        result["estimate"] = stats["estimate"]
+
     return json.dumps(result, indent=2, ensure_ascii=False)
 
 def show_banner():
@@ -166,11 +262,13 @@ def show_config_summary():
     config_text = f"""[bold]Playlist:[/bold] {WATCHLATER_URL}
 [bold]Output Directory:[/bold] {OUTPUT_DIR}
 [bold]Archive File:[/bold] {ARCHIVE_JSON}
-[bold]Cookies:[/bold] {'✓ Configured' if COOKIES_FILE else '✗ Not set'}
+[bold]Staging:[/bold] {'✓ ' + STAGING_DIR + ' (' + str(MOVER_WORKERS) + ' movers)' if STAGING_DIR else '✗ Disabled'}
+[bold]Cookies:[/bold] {'✓ Configured' if COOKIES_FILE else '✗ Not set'}{' (store: ' + COOKIE_STORE + ')' if COOKIE_STORE else ''}
 [bold]Webhook:[/bold] {'✓ Enabled (' + WEBHOOK_URL + ':' + str(WEBHOOK_PORT) + ')' if WEBHOOK_URL else '✗ Disabled'}
 [bold]Retention:[/bold] {retention_status}
 [bold]Playlist Order:[/bold] {playlist_order}
-[bold]Download Limit:[/bold] {max_dl_status} ({playlist_range})"""
+[bold]Download Limit:[/bold] {max_dl_status} ({playlist_range})
+[bold]Profile:[/bold] {DOWNLOAD_PROFILE}"""
 
     panel = Panel(
         config_text,
@@ -200,12 +298,14 @@ def show_completion_summary():
 
     # Add cleanup stats if any files were cleaned
     if stats['cleaned_files']:
-        size_mb = stats['cleaned_bytes'] / (1024 * 1024)
-        if size_mb >= 1024:
-            size_str = f"{size_mb / 1024:.2f} GB"
-        else:
-            size_str = f"{size_mb:.1f} MB"
-        summary_text += f"\n[bold orange1]Cleaned:[/bold orange1] {len(stats['cleaned_files'])} files ({size_str})"
+        summary_text += f"\n[bold orange1]Cleaned:[/bold orange1] {len(stats['cleaned_files'])} files ({format_size(stats['cleaned_bytes'])})"
+
+    # Add partial file cleanup stats if any leftovers were reclaimed
+    if stats['cleaned_partial_files']:
+        summary_text += f"\n[bold orange1]Partial Files Reclaimed:[/bold orange1] {len(stats['cleaned_partial_files'])} files ({format_size(stats['cleaned_partial_bytes'])})"
+
+    if stats['resumed']:
+        summary_text += f"\n[bold cyan]Resumed:[/bold cyan] {len(stats['resumed'])}"
 
     summary_text += f"\n[bold]Duration:[/bold] {minutes}m {seconds}s"
 
@@ -235,6 +335,33 @@ def show_completion_summary():
 
         console.print(table)
 
+def show_profile_estimates(estimates):
+    """Display per-profile size/merge estimates for the backlog"""
+    if JSON_OUTPUT:
+        return  # Estimates are part of the JSON output
+
+    table = Table(title="Backlog Estimate per Profile", box=box.SIMPLE, show_header=True, header_style="bold cyan")
+    table.add_column("Profile", style="cyan")
+    table.add_column("Videos", justify="right")
+    table.add_column("Est. Size", justify="right", style="green")
+    table.add_column("Merges", justify="right")
+    table.add_column("Unknown Size", justify="right", style="dim")
+    table.add_column("No Match", justify="right", style="dim")
+
+    for name, est in estimates.items():
+        label = f"{name} (active)" if name == DOWNLOAD_PROFILE else name
+        table.add_row(
+            label,
+            str(est["videos"]),
+            format_size(est["total_bytes"]),
+            str(est["merges"]),
+            str(est["unknown_size"]),
+            str(est["no_match"])
+        )
+
+    console.print(table)
+    console.print("[dim]ℹ️  Sizes are lower bounds when some streams don't report a size[/dim]")
+
 # Load archive (JSON mapping video_id -> metadata)
 def load_archive():
     if os.path.exists(ARCHIVE_JSON):
@@ -250,12 +377,279 @@ def save_archive(ar):
         json.dump(ar, f, indent=2, ensure_ascii=False)
     os.replace(tmp, ARCHIVE_JSON)
 
+# Load partial download state (JSON mapping video_id -> in-progress download info)
+def load_partial_state():
+    if os.path.exists(PARTIAL_STATE_JSON):
+        try:
+            with open(PARTIAL_STATE_JSON, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (ValueError, OSError) as e:
+            if not JSON_OUTPUT:
+                console.print(f"[yellow]⚠[/yellow] Ignoring unreadable partial state {PARTIAL_STATE_JSON}: {e}")
+    return {}
+
+# Save partial download state
+def save_partial_state():
+    global _partial_state_saved_at
+    tmp = PARTIAL_STATE_JSON + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(partial_state, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, PARTIAL_STATE_JSON)
+    _partial_state_saved_at = time.time()
+
+def partial_file_key(d):
+    """
+    Final filename of a hook's download. "downloading" hooks also report the
+    .part/-FragN temp name, "finished" hooks only the final one.
+    """
+    filename = d.get("filename") or d.get("tmpfilename")
+    if not filename:
+        return None
+    return re.sub(r"\.part(-Frag\d+(\.part)?)?$", "", filename)
+
+def track_partial_download(d):
+    """Record progress of a downloading file so an interrupted run can resume it."""
+    info = d.get("info_dict", {})
+    vid = info.get("id")
+    key = partial_file_key(d)
+    if not vid or not key:
+        return
+
+    entry = partial_state.setdefault(vid, {
+        "title": info.get("title"),
+        "webpage_url": info.get("webpage_url"),
+        "format_ids": [],
+        "files": {},
+        "profile": DOWNLOAD_PROFILE,  # A resumed download keeps the profile it started with
+    })
+    # Remember every format of a merged download (in download order) so the
+    # resume pass can pin the same selection and hit the same .part filenames
+    format_id = info.get("format_id")
+    if format_id and format_id not in entry["format_ids"]:
+        entry["format_ids"].append(format_id)
+        if len(entry["format_ids"]) == 1:
+            entry["video_only"] = info.get("acodec") == "none"
+    entry["files"][key] = {
+        "tmpfilename": d.get("tmpfilename"),
+        "format_id": format_id,
+        "expected_bytes": d.get("total_bytes") or d.get("total_bytes_estimate"),
+        "downloaded_bytes": d.get("downloaded_bytes", 0),
+    }
+    entry["updated_at"] = datetime.datetime.now(datetime.UTC).isoformat()
+
+    # Progress hooks fire many times per second, so only flush periodically
+    if time.time() - _partial_state_saved_at >= PARTIAL_STATE_SAVE_INTERVAL:
+        save_partial_state()
+
+def finish_partial_download(d):
+    """
+    Drop a completed file from the partial state. The video itself stays tracked
+    until post_hook sees the merged file, so an interruption between streams or
+    during the merge is still resumed.
+    """
+    info = d.get("info_dict", {})
+    vid = info.get("id")
+    entry = partial_state.get(vid)
+    if not entry:
+        return
+    entry["files"].pop(partial_file_key(d), None)
+    entry["updated_at"] = datetime.datetime.now(datetime.UTC).isoformat()
+    save_partial_state()
+
+def resume_format_spec(entry, default_format):
+    """Format selector that re-requests the formats recorded for an interrupted download."""
+    format_ids = entry.get("format_ids") or []
+    if not format_ids:
+        return default_format
+    spec = "+".join(format_ids)
+    if len(format_ids) == 1 and entry.get("video_only"):
+        # Interrupted before the audio stream started
+        spec += "+bestaudio"
+    return f"{spec}/{default_format}"
+
+# Load download profiles (built-ins plus custom profiles from PROFILES_JSON)
+def profile_value_problem(profile):
+    """Return why a profile's values can't be turned into a format spec, or None."""
+    max_height = profile.get("max_height")
+    if max_height is not None and (isinstance(max_height, bool) or not isinstance(max_height, int) or max_height <= 0):
+        return f"max_height must be a positive integer, got {max_height!r}"
+    size = profile.get("max_stream_size")
+    if size is not None and not (isinstance(size, str) and PROFILE_SIZE_RE.match(size)):
+        return f"max_stream_size must be a size like \"500M\", got {size!r}"
+    vcodec = profile.get("vcodec")
+    if vcodec is not None and not (isinstance(vcodec, str) and PROFILE_VCODEC_RE.match(vcodec)):
+        return f"vcodec must be a codec name like \"avc1\", got {vcodec!r}"
+    for flag in ("audio_only", "prefer_merge_free"):
+        if flag in profile and not isinstance(profile[flag], bool):
+            return f"{flag} must be true or false, got {profile[flag]!r}"
+    return None
+
+def load_download_profiles():
+    profiles = dict(DOWNLOAD_PROFILES)
+    if not PROFILES_JSON:
+        return profiles
+
+    try:
+        with open(PROFILES_JSON, "r", encoding="utf-8") as f:
+            custom = json.load(f)
+        if not isinstance(custom, dict):
+            raise ValueError("expected an object mapping profile names to profiles")
+    except (ValueError, OSError) as e:
+        if not JSON_OUTPUT:
+            console.print(f"[yellow]⚠[/yellow] Ignoring unreadable PROFILES_JSON {PROFILES_JSON}: {e}")
+        return profiles
+
+    for name, profile in custom.items():
+        if not isinstance(profile, dict):
+            problem = "not an object"
+        else:
+            unknown = [key for key in profile if key not in PROFILE_KEYS]
+            problem = f"unknown key(s) {', '.join(unknown)} (allowed: {', '.join(PROFILE_KEYS)})" if unknown else profile_value_problem(profile)
+        if problem:
+            if not JSON_OUTPUT:
+                console.print(f"[yellow]⚠[/yellow] Ignoring profile '{name}' in PROFILES_JSON: {problem}")
+            continue
+        profiles[name] = profile
+    return profiles
+
+def build_format_spec(profile):
+    """Translate a download profile into a yt-dlp format selector."""
+    # yt-dlp can only filter each stream (a filter on "(video+audio)" is checked after
+    # the best pair was picked), so the size cap applies per stream
+    size = ""
+    if profile.get("max_stream_size"):
+        limit = profile["max_stream_size"]
+        size = f"[filesize<?{limit}][filesize_approx<?{limit}]"
+    if profile.get("audio_only"):
+        return f"bestaudio{size}"
+
+    height = f"[height<=?{profile['max_height']}]" if profile.get("max_height") else ""
+    merged = f"bestvideo{height}{size}+bestaudio{size}"
+    if profile.get("vcodec"):
+        merged = f"bestvideo{height}[vcodec^={profile['vcodec']}]{size}+bestaudio{size}/{merged}"
+    muxed = f"best{height}{size}"  # Single file that already has video and audio
+
+    if profile.get("prefer_merge_free"):
+        return f"{muxed}/{merged}"
+    return f"{merged}/{muxed}"
+
+def select_formats(ydl, format_spec, formats):
+    """Return the formats yt-dlp would download for format_spec (without downloading)."""
+    selector = ydl.build_format_selector(format_spec)
+    return list(selector({
+        "formats": formats,
+        "has_merged_format": any("none" not in (f.get("acodec"), f.get("vcodec")) for f in formats),
+        "incomplete_formats": (all(f.get("vcodec") == "none" for f in formats)
+                               or all(f.get("acodec") == "none" for f in formats)),
+    }))
+
+def estimate_profile(ydl, profile, entries):
+    """Estimate total bytes and ffmpeg merges a profile would produce for entries."""
+    result = {"videos": 0, "total_bytes": 0, "merges": 0, "unknown_size": 0, "no_match": 0}
+    format_spec = build_format_spec(profile)
+    for ent in entries:
+        formats = ent.get("formats") or []
+        selected = select_formats(ydl, format_spec, formats) if formats else []
+        if not selected:
+            result["no_match"] += 1
+            continue
+        result["videos"] += 1
+        streams = selected[0].get("requested_formats") or [selected[0]]
+        if len(streams) > 1:
+            result["merges"] += 1
+        sizes = [f.get("filesize") or f.get("filesize_approx") for f in streams]
+        if not all(sizes):
+            result["unknown_size"] += 1
+        result["total_bytes"] += sum(size or 0 for size in sizes)
+    return result
+
+# Shared HTTP session state (reused for the lifetime of the process)
+_webhook_connections = {}
+_ssl_context = None
+
+def get_ssl_context():
+    """Return the process-wide SSL context shared by all pooled webhook connections."""
+    global _ssl_context
+    if _ssl_context is None:
+        _ssl_context = ssl.create_default_context()
+    return _ssl_context
+
+def get_webhook_connection(scheme, host, port):
+    """Return a keep-alive connection for the webhook host, reused across notifications."""
+    key = (scheme, host, port)
+    conn = _webhook_connections.get(key)
+    if conn is None:
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(host, port, timeout=10, context=get_ssl_context())
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=10)
+        _webhook_connections[key] = conn
+    return conn
+
+def drop_webhook_connection(scheme, host, port):
+    with webhook_lock:
+        conn = _webhook_connections.pop((scheme, host, port), None)
+        if conn is not None:
+            conn.close()
+
+def close_http_session():
+    """Close all pooled webhook connections."""
+    with webhook_lock:
+        for conn in _webhook_connections.values():
+            conn.close()
+        _webhook_connections.clear()
+
+def get_cookie_store():
+    """Path that refreshed cookies are persisted to (COOKIE_STORE, else COOKIES_FILE)."""
+    return COOKIE_STORE or COOKIES_FILE
+
+def load_session_cookies(ydl):
+    """
+    Seed the YoutubeDL cookie jar from the cookie store written by a previous run,
+    or from COOKIES_FILE when that is newer (e.g. freshly re-exported from the browser).
+    Returns False if a cookie file exists but could not be loaded, in which case
+    the jar must not be saved over it.
+    """
+    candidates = [p for p in (get_cookie_store(), COOKIES_FILE) if p and os.path.exists(p)]
+    if not candidates:
+        return True
+    source = max(candidates, key=os.path.getmtime)
+    try:
+        ydl.cookiejar.load(source)
+    except Exception as e:
+        if not JSON_OUTPUT:
+            console.print(f"[yellow]⚠[/yellow] Failed to load cookies from {source}: {e}")
+            console.print(f"[dim]   Cookies will not be saved back this run[/dim]")
+        return False
+    return True
+
+def save_session_cookies(ydl):
+    """Atomically write the (possibly refreshed) cookie jar back to the cookie store."""
+    store = get_cookie_store()
+    if not store:
+        return
+    # Never replace existing cookies with an empty jar
+    if len(ydl.cookiejar) == 0 and os.path.exists(store) and os.path.getsize(store) > 0:
+        return
+    # Per-process temp file so concurrent workers never interleave writes
+    tmp = f"{store}.{os.getpid()}.tmp"
+    try:
+        ydl.cookiejar.save(tmp)
+        os.chmod(tmp, 0o600)
+        os.replace(tmp, store)
+    except Exception as e:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        if not JSON_OUTPUT:
+            console.print(f"[yellow]⚠[/yellow] Failed to save cookies to {store}: {e}")
+
 # Send webhook notification
 def send_webhook(payload):
     """Send HTTP POST webhook with video metadata. Fails gracefully on errors."""
     if not WEBHOOK_URL:
         return  # Webhook not configured, skip silently
 
+    target = None
     try:
         # Parse URL and construct full endpoint with port
         parsed = urlparse(WEBHOOK_URL)
@@ -294,68 +688,75 @@ def send_webhook(payload):
         if WEBHOOK_SECRET:
             headers['Authorization'] = f'Bearer {WEBHOOK_SECRET}'
 
-        req = Request(full_url, data=json_data, headers=headers, method='POST')
-
-        # Send request with timeout
-        with urlopen(req, timeout=10) as response:
-            if response.status >= 200 and response.status < 300:
-                if not JSON_OUTPUT:
-                    console.print(f"[green]✓[/green] Webhook notification sent successfully")
-            else:
-                if not JSON_OUTPUT:
-                    console.print(f"[yellow]⚠[/yellow] Webhook returned status {response.status}")
+        parsed_full = urlparse(full_url)
+        target = (parsed_full.scheme, parsed_full.hostname, parsed_full.port)
+        path = parsed_full.path or "/"
+        if parsed_full.query:
+            path += f"?{parsed_full.query}"
+
+        # Send over the pooled keep-alive connection; if the server closed it while
+        # idle, reconnect once and retry
+        # (the pool is shared with the mover threads, so one request at a time)
+        with webhook_lock:
+            for attempt in range(2):
+                conn = get_webhook_connection(*target)
+                try:
+                    conn.request('POST', path, body=json_data, headers=headers)
+                    response = conn.getresponse()
+                    response.read()  # Drain body so the connection can be reused
+                    break
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    drop_webhook_connection(*target)
+                    if attempt:
+                        raise
+
+        if response.status >= 200 and response.status < 300:
+            if not JSON_OUTPUT:
+                console.print(f"[green]✓[/green] Webhook notification sent successfully")
+        elif response.status >= 400:
+            if not JSON_OUTPUT:
+                console.print(f"[yellow]⚠[/yellow] Webhook HTTP error {response.status}: {response.reason}")
+        else:
+            if not JSON_OUTPUT:
+                console.print(f"[yellow]⚠[/yellow] Webhook returned status {response.status}")
 
-    except HTTPError as e:
-        if not JSON_OUTPUT:
-            console.print(f"[yellow]⚠[/yellow] Webhook HTTP error {e.code}: {e.reason}")
-    except URLError as e:
-        if not JSON_OUTPUT:
-            console.print(f"[yellow]⚠[/yellow] Webhook URL error: {e.reason}")
     except TimeoutError:
+        if target:
+            drop_webhook_connection(*target)
         if not JSON_OUTPUT:
             console.print(f"[yellow]⚠[/yellow] Webhook request timed out")
+    except OSError as e:
+        if target:
+            drop_webhook_connection(*target)
+        if not JSON_OUTPUT:
+            console.print(f"[yellow]⚠[/yellow] Webhook URL error: {e}")
     except Exception as e:
+        if target:
+            drop_webhook_connection(*target)
         if not JSON_OUTPUT:
             console.print(f"[yellow]⚠[/yellow] Webhook failed: {e}")
 
 # Hook: called periodically with download status
 def progress_hook(d):
     # d is a dict with info, see d['status'] in {"downloading", "finished", "error"}
-    if d.get("status") == "finished":
-        # final path
-        filepath = d.get("filename")
+    if d.get("status") == "downloading":
+        track_partial_download(d)
+    elif d.get("status") == "finished":
+        finish_partial_download(d)
+
+        # For merged formats this is one of the per-format files; the archive entry
+        # is created by post_hook once merging has finished and the final path is known
         info = d.get("info_dict", {})
         vid = info.get("id")
-        # In some cases, filename may still be temp; but here we assume it's final
-        if vid:
-            # record in archive
-            archive = load_archive()
-            if vid not in archive:
-                metadata = {
-                    "video_id": vid,
-                    "title": info.get("title"),
-                    "upload_date": info.get("upload_date"),
-                    "download_date": datetime.datetime.now(datetime.UTC).isoformat(),
-                    "filepath": filepath,
-                }
-                # Save to archive (use original format without video_id key)
-                archive[vid] = {
-                    "title": metadata["title"],
-                    "upload_date": metadata["upload_date"],
-                    "download_date": metadata["download_date"],
-                    "filepath": metadata["filepath"],
-                }
-                save_archive(archive)
-
-                # Track in stats
-                stats["downloaded"].append(metadata)
-
-                # Display success message (skip in JSON mode)
-                if not JSON_OUTPUT:
-                    console.print(f"[green]✅ Downloaded:[/green] {metadata.get('title', 'Unknown')}")
-
-                # Send webhook notification (includes video_id in payload)
-                send_webhook(metadata)
+        if vid and vid not in pending_downloads:
+            pending_downloads[vid] = {
+                "video_id": vid,
+                "title": info.get("title"),
+                "upload_date": info.get("upload_date"),
+                "download_date": datetime.datetime.now(datetime.UTC).isoformat(),
+                "filepath": d.get("filename"),
+                "profile": partial_state.get(vid, {}).get("profile", DOWNLOAD_PROFILE),
+            }
     elif d.get("status") == "error":
         # Track download errors
         info = d.get("info_dict", {})
@@ -372,12 +773,209 @@ def progress_hook(d):
         if not JSON_OUTPUT:
             console.print(f"[red]❌ Error:[/red] {title} [dim](ID: {vid})[/dim]")
             console.print(f"[dim]   Skipping and continuing with next video...[/dim]\n")
-    # (you could also track progress in "downloading" status if you like)
+
+# Hook: called with the final file path once post-processing (merging) has finished
+def post_hook(filepath):
+    # Output template guarantees "... [video_id].ext"
+    match = re.search(r"\[([^\]]+)\]\.\w+$", os.path.basename(filepath))
+    if not match:
+        return
+    vid = match.group(1)
+    metadata = pending_downloads.pop(vid, None)
+
+    # Final file exists, nothing left to resume
+    if partial_state.pop(vid, None) is not None:
+        save_partial_state()
+
+    if not metadata:
+        return  # Not downloaded in this run (e.g. already archived)
+
+    if STAGING_DIR:
+        # Archive entry and webhook are created when the move commits
+        enqueue_move(vid, filepath, metadata)
+        return
+
+    if record_download(metadata, filepath):
+        # Send webhook notification (includes video_id in payload)
+        send_webhook(metadata)
+
+def record_download(metadata, filepath):
+    """Archive a finished download under filepath. Returns False if it was already archived."""
+    vid = metadata["video_id"]
+    metadata["filepath"] = filepath
+    with archive_lock:
+        archive = load_archive()
+        if vid in archive:
+            return False
+        # Save to archive (use original format without video_id key)
+        archive[vid] = {
+            "title": metadata["title"],
+            "upload_date": metadata["upload_date"],
+            "download_date": metadata["download_date"],
+            "filepath": metadata["filepath"],
+            "profile": metadata["profile"],
+        }
+        save_archive(archive)
+
+    # Track in stats
+    stats["downloaded"].append(metadata)
+
+    # Display success message (skip in JSON mode)
+    if not JSON_OUTPUT:
+        console.print(f"[green]✅ Downloaded:[/green] {metadata.get('title', 'Unknown')}")
+    return True
+
+def update_archive_filepath(vid, filepath):
+    """Point the archive entry (and run stats) for vid at filepath."""
+    with archive_lock:
+        archive = load_archive()
+        if vid in archive and archive[vid].get("filepath") != filepath:
+            archive[vid]["filepath"] = filepath
+            save_archive(archive)
+        for video in stats["downloaded"]:
+            if video.get("video_id") == vid:
+                video["filepath"] = filepath
+
+# Load move queue (JSON mapping staging path -> pending move)
+def load_move_queue():
+    if os.path.exists(MOVE_QUEUE_JSON):
+        try:
+            with open(MOVE_QUEUE_JSON, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (ValueError, OSError) as e:
+            if not JSON_OUTPUT:
+                console.print(f"[yellow]⚠[/yellow] Ignoring unreadable move queue {MOVE_QUEUE_JSON}: {e}")
+    return {}
+
+# Save move queue
+def save_move_queue():
+    with archive_lock:
+        tmp = MOVE_QUEUE_JSON + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(move_queue, f, indent=2, ensure_ascii=False)
+        os.replace(tmp, MOVE_QUEUE_JSON)
+
+def fsync_dir(path):
+    """Flush a directory entry (rename) to disk; not supported on every platform."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def copy_then_rename(src, dest):
+    """
+    Move src to dest so dest is either absent or complete: a plain rename on the
+    same filesystem, otherwise copy to a temp file next to dest, fsync, verify the
+    size, rename into place and only then delete src.
+    """
+    dest_dir = os.path.dirname(dest) or "."
+    os.makedirs(dest_dir, exist_ok=True)
+    if os.stat(src).st_dev == os.stat(dest_dir).st_dev:
+        os.replace(src, dest)
+        fsync_dir(dest_dir)
+        return
+
+    tmp = dest + ".moving"
+    shutil.copyfile(src, tmp)
+    with open(tmp, "rb+") as f:
+        os.fsync(f.fileno())
+    src_size = os.path.getsize(src)
+    copied_size = os.path.getsize(tmp)
+    if copied_size != src_size:
+        os.remove(tmp)
+        raise OSError(f"size mismatch after copy ({copied_size} of {src_size} bytes)")
+    shutil.copystat(src, tmp)  # Keep mtime (yt-dlp sets it to the upload date)
+    os.replace(tmp, dest)
+    fsync_dir(dest_dir)
+    os.remove(src)
+
+def commit_move(src, dest):
+    """Record a finished move: the download is archived under dest, then announced."""
+    with archive_lock:
+        job = move_queue.get(src)
+        if not job:
+            return
+        # Archive before dequeuing: if we're killed in between, the next run finds
+        # dest in place and re-commits (record_download skips archived videos)
+        metadata = job.get("metadata")
+        if metadata:
+            recorded = record_download(metadata, dest)
+        else:
+            update_archive_filepath(job["video_id"], dest)
+            recorded = False
+        move_queue.pop(src, None)
+        save_move_queue()
+
+    # Outside the lock so a slow webhook never blocks the download thread's hooks
+    if recorded:
+        send_webhook(metadata)
+
+def run_move(src, dest):
+    try:
+        copy_then_rename(src, dest)
+    except Exception as e:
+        # Job stays in the move queue and is retried on the next run
+        if not JSON_OUTPUT:
+            console.print(f"[yellow]⚠[/yellow] Moving {escape(os.path.basename(src))} failed (will retry next run): {e}")
+        return
+    commit_move(src, dest)
+    if not JSON_OUTPUT:
+        console.print(f"[green]📦 Moved:[/green] {escape(os.path.basename(dest))}")
+
+def submit_move(src, dest):
+    global _mover
+    if _mover is None:
+        try:
+            workers = max(int(MOVER_WORKERS), 1)
+        except ValueError:
+            workers = 2
+        _mover = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mover")
+    _mover.submit(run_move, src, dest)
+
+def enqueue_move(vid, src, metadata=None):
+    """Persist a move of a finished staged file to OUTPUT_DIR and hand it to the mover."""
+    dest = os.path.join(OUTPUT_DIR, os.path.relpath(src, STAGING_DIR))
+    with archive_lock:
+        move_queue[src] = {"video_id": vid, "dest": dest, "metadata": metadata}
+        save_move_queue()
+    submit_move(src, dest)
+
+def resume_pending_moves():
+    """Re-submit moves queued by a previous run that never committed."""
+    move_queue.update(load_move_queue())
+    for src, job in list(move_queue.items()):
+        dest = job["dest"]
+        if os.path.exists(src):
+            submit_move(src, dest)
+        elif os.path.exists(dest):
+            # File was moved but the bookkeeping was interrupted
+            commit_move(src, dest)
+        else:
+            if not JSON_OUTPUT:
+                console.print(f"[yellow]⚠[/yellow] Dropping queued move, file is gone: {escape(src)}")
+            with archive_lock:
+                move_queue.pop(src, None)
+                save_move_queue()
+
+def wait_for_moves(cancel_pending=False):
+    """Block until the mover is idle (optionally dropping moves not started yet)."""
+    global _mover
+    if _mover is None:
+        return
+    _mover.shutdown(wait=True, cancel_futures=cancel_pending)
+    _mover = None
 
 def determine_outtmpl():
     # Template tries upload date; fallback to placeholder that we’ll rename later
     # Use a placeholder prefix “ZZZ” or something so fallback ones cluster
-    return os.path.join(OUTPUT_DIR, "%(upload_date)s %(title)s [%(id)s].%(ext)s")
+    # (directory comes from "paths": OUTPUT_DIR, or STAGING_DIR when staging)
+    return "%(upload_date)s %(title)s [%(id)s].%(ext)s"
 
 def rename_fallback_missing_timestamp(filepath, info):
     """
@@ -484,19 +1082,77 @@ def cleanup_old_files(archive, retention_days):
 
     # Show summary
     if deleted_count > 0:
-        size_mb = stats["cleaned_bytes"] / (1024 * 1024)
-        if size_mb >= 1024:
-            size_str = f"{size_mb / 1024:.2f} GB"
-        else:
-            size_str = f"{size_mb:.1f} MB"
         if not JSON_OUTPUT:
-            console.print(f"[green]✅ Cleanup complete:[/green] Removed {deleted_count} file(s), freed {size_str}")
+            console.print(f"[green]✅ Cleanup complete:[/green] Removed {deleted_count} file(s), freed {format_size(stats['cleaned_bytes'])}")
 
     if not JSON_OUTPUT:
         console.print()
     return archive
 
+def cleanup_partial_files(max_age_days, archive):
+    """
+    Delete orphaned partial files (.part, fragments, per-format intermediates) in
+    OUTPUT_DIR/STAGING_DIR not written to for max_age_days, and forget tracked
+    downloads that went stale. Recent partial files are kept so they can be resumed,
+    and files the archive points at are never deleted.
+    """
+    if not max_age_days or max_age_days <= 0:
+        return
+
+    cutoff = time.time() - max_age_days * 86400
+
+    # Forget in-progress downloads nobody resumed within the window
+    cutoff_iso = datetime.datetime.fromtimestamp(cutoff, datetime.UTC).isoformat()
+    stale = [vid for vid, entry in partial_state.items() if entry.get("updated_at", "") < cutoff_iso]
+    for vid in stale:
+        partial_state.pop(vid, None)
+
+    # Older archive entries may point at a per-format file (e.g. "... [id].f137.mp4")
+    archived = {os.path.abspath(meta["filepath"]) for meta in archive.values() if meta.get("filepath")}
+
+    to_delete = []
+    for directory in (OUTPUT_DIR, STAGING_DIR):
+        if not directory or not os.path.isdir(directory):
+            continue
+        for name in os.listdir(directory):
+            if not PARTIAL_FILE_RE.search(name):
+                continue
+            path = os.path.join(directory, name)
+            if os.path.abspath(path) in archived:
+                continue
+            try:
+                if os.path.isfile(path) and os.path.getmtime(path) < cutoff:
+                    to_delete.append(path)
+            except OSError:
+                continue
+
+    if not to_delete:
+        return
+
+    if not JSON_OUTPUT:
+        console.print(f"[cyan]🗑️  Removing {len(to_delete)} orphaned partial file(s) older than {max_age_days} days...[/cyan]")
+
+    for path in to_delete:
+        try:
+            file_size = os.path.getsize(path)
+            os.remove(path)
+            stats["cleaned_partial_files"].append(path)
+            stats["cleaned_partial_bytes"] += file_size
+            if not JSON_OUTPUT:
+                console.print(f"[dim]  Deleted: {escape(os.path.basename(path))}[/dim]")
+        except FileNotFoundError:
+            continue
+        except Exception as e:
+            if not JSON_OUTPUT:
+                console.print(f"[yellow]⚠[/yellow] Error deleting {path}: {e}")
+
+    if stats["cleaned_partial_files"] and not JSON_OUTPUT:
+        console.print(f"[green]✅ Partial cleanup complete:[/green] Reclaimed {format_size(stats['cleaned_partial_bytes'])}")
+        console.print()
+
 def run_download():
+    global DOWNLOAD_PROFILE
+
     # Initialize start time
     stats["start_time"] = time.time()
 
@@ -505,10 +1161,12 @@ def run_download():
     show_config_summary()
 
     os.makedirs(OUTPUT_DIR, exist_ok=True)
+    if STAGING_DIR:
+        os.makedirs(STAGING_DIR, exist_ok=True)
     archive = load_archive()
 
-    # Run cleanup if retention is configured
-    if RETENTION_DAYS:
+    # Run cleanup if retention is configured (never in an --estimate dry run)
+    if RETENTION_DAYS and not args.estimate:
         try:
             retention_days = int(RETENTION_DAYS)
             if retention_days > 0:
@@ -523,10 +1181,40 @@ def run_download():
                 console.print(f"[yellow]⚠[/yellow] Invalid RETENTION_DAYS value: {RETENTION_DAYS} (cleanup disabled)")
                 console.print()
 
+    # Load in-progress downloads from previous runs and reclaim orphaned partial files
+    partial_state.update(load_partial_state())
+    for vid in [vid for vid in partial_state if vid in archive]:
+        partial_state.pop(vid)  # Already archived; any leftovers are collected below
+    if PARTIAL_MAX_AGE_DAYS and not args.estimate:
+        try:
+            cleanup_partial_files(int(PARTIAL_MAX_AGE_DAYS), archive)
+        except ValueError:
+            if not JSON_OUTPUT:
+                console.print(f"[yellow]⚠[/yellow] Invalid PARTIAL_MAX_AGE_DAYS value: {PARTIAL_MAX_AGE_DAYS} (partial cleanup disabled)")
+                console.print()
+    save_partial_state()
+
+    # Finish moving files staged by a previous run in the background
+    if STAGING_DIR and not args.estimate:
+        resume_pending_moves()
+
+    # Resolve the download profile for this run
+    profiles = load_download_profiles()
+    if DOWNLOAD_PROFILE not in profiles:
+        if not JSON_OUTPUT:
+            console.print(f"[yellow]⚠[/yellow] Unknown DOWNLOAD_PROFILE: {DOWNLOAD_PROFILE} (using 'best'; available: {', '.join(profiles)})")
+            console.print()
+        DOWNLOAD_PROFILE = "best"
+
     ydl_opts = {
-        "format": "bestvideo+bestaudio/best",
-        "paths": {"home": OUTPUT_DIR},
+        # An --estimate run extracts with a selector every video satisfies, so no entry
+        # is dropped for failing the active profile before all profiles are compared
+        "format": "b*" if args.estimate else build_format_spec(profiles[DOWNLOAD_PROFILE]),
+        # With staging, fragments, .part files and merges stay on local disk;
+        # finished files are moved to OUTPUT_DIR by the background mover
+        "paths": {"home": STAGING_DIR or OUTPUT_DIR},
         "progress_hooks": [progress_hook],
+        "post_hooks": [post_hook],  # Called with the final (merged) file path
         "download_archive": None,  # we won't use the built-in archive, we use JSON
         "outtmpl": determine_outtmpl(),
         "merge_output_format": "mp4",  # or mkv, as you prefer
@@ -534,6 +1222,7 @@ def run_download():
         "no_warnings": JSON_OUTPUT,  # Suppress warnings in JSON mode
         "verbose": not JSON_OUTPUT,  # Only verbose in normal mode
         "ignoreerrors": True,  # Continue on download errors (e.g., private/unavailable videos)
+        "continuedl": True,  # Resume .part files left by interrupted runs
         # set mtime so the file timestamp matches upload date (if available)
         # default behavior of yt-dlp is to set file mtime to upload-date if known. (see man)
         # If you want always use download time, you can disable it:
@@ -544,8 +1233,8 @@ def run_download():
     }
 
     # Add optional playlist management settings
-    if COOKIES_FILE:
-        ydl_opts["cookiefile"] = COOKIES_FILE
+    # (cookies are loaded/saved via the shared session helpers instead of "cookiefile",
+    # so refreshed cookies are written back atomically)
     if MAX_DOWNLOADS:
         try:
             ydl_opts["max_downloads"] = int(MAX_DOWNLOADS)
@@ -598,8 +1287,13 @@ def run_download():
         sys.stdout = open(os.devnull, 'w')
         sys.stderr = open(os.devnull, 'w')
 
+    ydl = None
+    cookies_loaded = False
+    json_result = None
     try:
         with YoutubeDL(ydl_opts) as ydl:
+            cookies_loaded = load_session_cookies(ydl)
+
             # Extract playlist info with limited scope
             info = ydl.extract_info(WATCHLATER_URL, download=False)
             entries = info.get("entries", [])
@@ -608,27 +1302,57 @@ def run_download():
             # Since we disabled playlistreverse, entries are in oldest-first order
             # We need to reverse them to get newest-first, then filter
             to_download = []
+            backlog = []  # Entries of to_download, for --estimate
             skipped_count = 0
 
+            # Interrupted downloads from previous runs are resumed first, even if they
+            # have since dropped out of the checked playlist window
+            # (they count towards MAX_DOWNLOADS, which yt-dlp enforces per YoutubeDL instance)
+            to_resume = {vid: entry for vid, entry in partial_state.items() if entry.get("webpage_url")}
+            if max_dl:
+                to_resume = dict(list(to_resume.items())[:max_dl])
+
+            # Staged videos still waiting for the mover are archived once their move commits
+            with archive_lock:
+                queued = {job["video_id"] for job in move_queue.values()}
+
             # Reverse the entries to get newest first (since playlistreverse was disabled)
             entries_reversed = list(reversed(entries))
 
             for ent in entries_reversed:
+                if not ent:
+                    continue  # Extraction failed (ignoreerrors)
                 vid = ent.get("id")
-                if vid is None:
+                if vid is None or vid in to_resume:
                     continue
-                if vid in archive:
+                if vid in archive or vid in queued:
                     stats["skipped"].append({"video_id": vid, "title": ent.get('title')})
                     skipped_count += 1
                     if not JSON_OUTPUT:
                         console.print(f"[yellow]⏭️  Skipped:[/yellow] {ent.get('title', 'Unknown')} [dim](already downloaded)[/dim]")
                 else:
                     to_download.append(ent.get("webpage_url"))
+                    backlog.append(ent)
                     # Stop if we've reached max downloads limit
-                    if max_dl and len(to_download) >= max_dl:
+                    if max_dl and len(to_download) + len(to_resume) >= max_dl:
                         break
 
-            if not to_download:
+            # Dry run: compare what each profile would download for the backlog
+            if args.estimate:
+                # Interrupted downloads are part of the backlog too; they only have a URL so far
+                for entry in to_resume.values():
+                    backlog.append(ydl.extract_info(entry["webpage_url"], download=False) or {})
+                if not JSON_OUTPUT:
+                    console.print(f"\n[cyan]📐 Estimating {len(backlog)} video(s) for {len(profiles)} profile(s)...[/cyan]\n")
+                stats["estimate"] = {
+                    name: estimate_profile(ydl, profile, backlog) for name, profile in profiles.items()
+                }
+                show_profile_estimates(stats["estimate"])
+                if JSON_OUTPUT:
+                    json_result = format_json_output()
+                return
+
+            if not to_download and not to_resume:
                 if not JSON_OUTPUT:
                     console.print("[yellow]ℹ️  Nothing new to download.[/yellow]")
                     if skipped_count > 0:
@@ -636,12 +1360,45 @@ def run_download():
                 show_completion_summary()
                 return
 
+            # Now actually download with proper limiting
+            # Use yt-dlp's built-in max_downloads if we have a limit
+            if max_dl and len(to_download) + len(to_resume) > max_dl:
+                # Limit the downloads to max_dl videos (resumed downloads included)
+                to_download = to_download[:max(max_dl - len(to_resume), 0)]
+                if not JSON_OUTPUT:
+                    console.print(f"[cyan]📝 Limited to {max_dl} downloads as configured[/cyan]\n")
+
+            # Track which videos we're attempting to download
+            attempted_videos = {vid: entry["webpage_url"] for vid, entry in to_resume.items()}
+
+            # Resume interrupted downloads with their original formats pinned so yt-dlp
+            # picks up the existing .part files instead of starting over
+            if to_resume:
+                if not JSON_OUTPUT:
+                    console.print(f"\n[cyan]⏯️  Resuming {len(to_resume)} interrupted download(s)...[/cyan]\n")
+                default_format_selector = ydl.format_selector
+                try:
+                    for vid, entry in to_resume.items():
+                        done = sum(f.get("downloaded_bytes") or 0 for f in entry.get("files", {}).values())
+                        if not JSON_OUTPUT:
+                            console.print(f"[cyan]⏯️  Resuming:[/cyan] {escape(entry.get('title') or vid)} [dim]({format_size(done)} already downloaded)[/dim]")
+                        ydl.format_selector = ydl.build_format_selector(
+                            resume_format_spec(entry, ydl_opts["format"]))
+                        ydl.download([entry["webpage_url"]])
+                        if vid in partial_state:
+                            # post_hook never saw the final file; reported as an error below,
+                            # and not retried on every run while the video stays unavailable
+                            partial_state.pop(vid, None)
+                            save_partial_state()
+                        else:
+                            stats["resumed"].append(vid)
+                finally:
+                    ydl.format_selector = default_format_selector
+
             # Show download count
-            if not JSON_OUTPUT:
+            if to_download and not JSON_OUTPUT:
                 console.print(f"\n[cyan]📥 Downloading {len(to_download)} new video(s)...[/cyan]\n")
 
-            # Track which videos we're attempting to download
-            attempted_videos = {}
             for url in to_download:
                 try:
                     # Extract video ID from URL
@@ -655,21 +1412,22 @@ def run_download():
                 except:
                     pass
 
-            # Now actually download with proper limiting
-            # Use yt-dlp's built-in max_downloads if we have a limit
-            if max_dl and len(to_download) > max_dl:
-                # Limit the downloads to max_dl videos
-                to_download = to_download[:max_dl]
-                if not JSON_OUTPUT:
-                    console.print(f"[cyan]📝 Limited to {max_dl} downloads as configured[/cyan]\n")
-
             # Download the videos
-            ydl.download(to_download)
+            if to_download:
+                ydl.download(to_download)
+
+            # Archive paths must be final before the checks and renaming below
+            wait_for_moves()
 
             # After download, check which videos failed (attempted but not downloaded)
             archive_after = load_archive()
             downloaded_ids = set(stats["downloaded"])
+            # Downloaded but the move failed; archived once the move succeeds next run
+            with archive_lock:
+                move_pending = {job["video_id"] for job in move_queue.values()}
             for vid, url in attempted_videos.items():
+                if vid in move_pending:
+                    continue
                 if vid not in archive_after and vid not in [d.get("video_id") for d in stats["downloaded"]]:
                     # This video was attempted but not downloaded
                     if vid not in [e.get("video_id") for e in stats["errors"]]:
@@ -700,17 +1458,30 @@ def run_download():
         # Show completion summary
         show_completion_summary()
 
-        # Output JSON if in JSON mode
+        # Output JSON if in JSON mode (printed once stdout is restored below)
         if JSON_OUTPUT:
-            print(format_json_output())
+            json_result = format_json_output()
 
     finally:
+        # Let in-flight moves commit; moves not started yet stay queued for the next run
+        wait_for_moves(cancel_pending=True)
+
+        # Flush in-progress download state so an interrupted run can be resumed
+        save_partial_state()
+
+        # Persist refreshed cookies for the next run and release pooled connections
+        if ydl is not None and cookies_loaded:
+            save_session_cookies(ydl)
+        close_http_session()
+
         # Restore stdout/stderr in JSON mode
         if JSON_OUTPUT:
             sys.stdout.close()
             sys.stderr.close()
             sys.stdout = original_stdout
             sys.stderr = original_stderr
+            if json_result is not None:
+                print(json_result)
 
 if __name__ == "__main__":
     try: